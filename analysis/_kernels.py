@@ -0,0 +1,84 @@
+"""_kernels.py
+
+Low-level reduction kernels for frames that are already sorted by
+group key (see ``load_spotify_charts``, which sorts by song).
+
+When Numba is installed the kernels are JIT-compiled to machine code
+and run the segments in parallel with ``prange`` — each segment is
+independent, so this scales across cores.  Without Numba we fall back
+to plain NumPy versions with the same signatures, so callers never
+need to care which one they got.
+
+Both kernels take:
+
+- ``values`` / ``codes``: an int64 array, one element per row.
+- ``starts``: row positions where each group begins (the first element
+  is always 0), as produced by ``_sorted_song_starts``.
+
+and return one int64 result per group.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, parallel=True)
+    def sorted_segment_sum(values, starts):
+        """Sum ``values`` within each contiguous segment."""
+        n_groups = starts.shape[0]
+        n_rows = values.shape[0]
+        out = np.empty(n_groups, dtype=np.int64)
+        for i in prange(n_groups):
+            end = starts[i + 1] if i + 1 < n_groups else n_rows
+            total = 0
+            for j in range(starts[i], end):
+                total += values[j]
+            out[i] = total
+        return out
+
+    @njit(cache=True, parallel=True)
+    def sorted_segment_nunique(codes, starts):
+        """Count distinct non-negative ``codes`` within each segment.
+
+        Negative codes mean "missing" (pandas categorical/factorize
+        convention) and are not counted.
+        """
+        n_groups = starts.shape[0]
+        n_rows = codes.shape[0]
+        out = np.empty(n_groups, dtype=np.int64)
+        for i in prange(n_groups):
+            end = starts[i + 1] if i + 1 < n_groups else n_rows
+            segment = np.sort(codes[starts[i]:end].copy())
+            count = 0
+            previous = -1
+            for j in range(segment.shape[0]):
+                code = segment[j]
+                if code >= 0 and code != previous:
+                    count += 1
+                    previous = code
+            out[i] = count
+        return out
+
+else:
+
+    def sorted_segment_sum(values, starts):
+        """NumPy fallback: sum ``values`` within each segment."""
+        return np.add.reduceat(values, starts).astype(np.int64)
+
+    def sorted_segment_nunique(codes, starts):
+        """NumPy fallback: distinct non-negative codes per segment."""
+        n_rows = codes.shape[0]
+        ends = np.r_[starts[1:], n_rows]
+        out = np.empty(len(starts), dtype=np.int64)
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            segment = codes[start:end]
+            out[i] = len(np.unique(segment[segment >= 0]))
+        return out
@@ -11,12 +11,17 @@ It prints:
 
 """
 
+import os
+
 from spotify_analysis import (
     load_spotify_charts,
-    compute_country_song_counts,
+    compute_song_summary,
     compute_chart_diversity_by_country,
-    compute_average_days_on_chart,
-    compute_top_songs_by_streams,
+)
+from spotify_analysis_polars import (
+    POLARS_AVAILABLE,
+    compute_song_summary_polars,
+    compute_chart_diversity_by_country_polars,
 )
 
 
@@ -45,45 +50,70 @@ def main():
     print("Columns:", list(df.columns))
     print()
 
+    # 4) Compute all per-song metrics (countries, days on chart,
+    #    total streams) in one fused groupby pass.  The three views
+    #    below just rank this one summary table.
+    #
+    #    Set POLARS=1 in the environment to run the aggregations with
+    #    the (much faster) Polars implementations when polars is
+    #    installed.
+    use_polars = os.environ.get("POLARS") == "1" and POLARS_AVAILABLE
+    if use_polars:
+        print("[INFO] Using the Polars implementations.")
+        print()
 
-    # 4) Top songs by number of countries they appear in.
     try:
-        print("=== Top 10 songs by number of countries ===")
-        song_country_counts = compute_country_song_counts(df)
-        print(song_country_counts.head(10))
-        print()
+        if use_polars:
+            summary = compute_song_summary_polars(csv_name)
+        else:
+            summary = compute_song_summary(df)
     except Exception as exc:
-        print("[WARN] Could not compute country song counts:", exc)
+        print("[WARN] Could not compute the per-song summary:", exc)
+        summary = None
+
+    # 5) Top songs by number of countries they appear in.
+    if summary is not None:
+        print("=== Top 10 songs by number of countries ===")
+        print(
+            summary.nlargest(10, "country_count")[
+                ["track_name", "artist", "country_count"]
+            ]
+        )
         print()
 
-    # 5) Chart diversity per country (how many unique tracks).
+    # 6) Chart diversity per country (how many unique tracks).
     try:
         print("=== Chart diversity per country (top 10) ===")
-        diversity = compute_chart_diversity_by_country(df)
-        print(diversity.head(10))
+        if use_polars:
+            diversity = compute_chart_diversity_by_country_polars(
+                csv_name, top_n=10
+            )
+        else:
+            diversity = compute_chart_diversity_by_country(df, top_n=10)
+        print(diversity)
         print()
     except Exception as exc:
         print("[WARN] Could not compute chart diversity:", exc)
         print()
 
-    # 6) Average days on chart per song (approximate).
-    try:
+    # 7) Average days on chart per song (approximate).
+    if summary is not None:
         print("=== Songs with most days on chart (top 10) ===")
-        days_on_chart = compute_average_days_on_chart(df)
-        print(days_on_chart.head(10))
-        print()
-    except Exception as exc:
-        print("[WARN] Could not compute days on chart:", exc)
+        print(
+            summary.nlargest(10, "days_on_chart")[
+                ["track_name", "artist", "days_on_chart"]
+            ]
+        )
         print()
 
-    # 7) Top songs by total streams (across all countries).
-    try:
+    # 8) Top songs by total streams (across all countries).
+    if summary is not None:
         print("=== Top 10 songs by total streams ===")
-        top_streams = compute_top_songs_by_streams(df, n=10)
-        print(top_streams)
-        print()
-    except Exception as exc:
-        print("[WARN] Could not compute top songs by streams:", exc)
+        print(
+            summary.nlargest(10, "total_streams")[
+                ["track_name", "artist", "total_streams"]
+            ]
+        )
         print()
 
 
@@ -0,0 +1,105 @@
+"""spotify_analysis_duckdb.py
+
+Optional DuckDB version of the per-song summary.
+
+DuckDB runs plain SQL over CSV or Parquet files with a vectorized,
+multi-threaded engine — no intermediate DataFrame is ever
+materialized, the file is streamed in column chunks.  Like the Polars
+module, this one returns pandas DataFrames with the same columns as
+``spotify_analysis.compute_song_summary`` so callers can swap it in
+freely.
+
+DuckDB is an optional dependency: check ``DUCKDB_AVAILABLE`` before
+calling anything.
+"""
+
+from pathlib import Path
+
+try:
+    import duckdb
+
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+# Same data folders as the pandas implementation.
+DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "raw"
+PROCESSED_DIR = Path(__file__).resolve().parents[1] / "data" / "processed"
+
+
+def _require_duckdb():
+    """Raise a clear error when DuckDB is not installed."""
+    if not DUCKDB_AVAILABLE:
+        raise ImportError(
+            "duckdb is not installed; run 'pip install duckdb' or use the "
+            "pandas functions in spotify_analysis.py instead."
+        )
+
+
+def _charts_source(csv_name):
+    """Pick the fastest readable source for a charts file.
+
+    Prefers the normalized Parquet cache written by
+    ``load_spotify_charts`` when it is up to date (DuckDB reads Parquet
+    much faster than CSV), otherwise falls back to the raw CSV.
+    Returns the matching ``read_parquet`` / ``read_csv_auto`` table
+    expression with the path already validated.
+    """
+    csv_path = DATA_DIR / csv_name
+
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found at: {csv_path}")
+
+    cache_path = PROCESSED_DIR / (csv_name + ".parquet")
+    if (
+        cache_path.exists()
+        and cache_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        return "read_parquet(?)", str(cache_path)
+
+    return "read_csv_auto(?)", str(csv_path)
+
+
+def compute_song_summary_duckdb(csv_name, top_n=None):
+    """DuckDB version of ``spotify_analysis.compute_song_summary``.
+
+    Parameters
+    ----------
+    csv_name : str
+        File name inside ``data/raw``, e.g. ``"charts_2023.csv"``.
+    top_n : int, optional
+        If given, return only the ``top_n`` songs by total streams.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per song with ``track_name``, ``artist``,
+        ``country_count``, ``days_on_chart`` and ``total_streams``,
+        sorted by ``total_streams`` in descending order.
+    """
+    _require_duckdb()
+
+    source, path = _charts_source(csv_name)
+
+    # The raw CSV still has the original column names; the Parquet
+    # cache is already normalized.  COALESCE-style aliasing in SQL
+    # would be awkward, so branch on the source instead.
+    track_col = "track_name" if "parquet" in source else "name"
+    artist_col = "artist" if "parquet" in source else "artists"
+
+    query = f"""
+        SELECT
+            {track_col} AS track_name,
+            {artist_col} AS artist,
+            COUNT(DISTINCT country) AS country_count,
+            COUNT(DISTINCT date) AS days_on_chart,
+            SUM(streams) AS total_streams
+        FROM {source}
+        GROUP BY 1, 2
+        ORDER BY total_streams DESC
+    """
+    if top_n is not None:
+        query += f" LIMIT {int(top_n)}"
+
+    return duckdb.sql(query, params=[path]).df()
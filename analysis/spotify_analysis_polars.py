@@ -0,0 +1,117 @@
+"""spotify_analysis_polars.py
+
+Optional Polars versions of the heavy analysis computations.
+
+Polars runs the same group-by/aggregate work in Rust with a thread
+pool, which is typically several times faster than pandas on this kind
+of columnar workload.  The functions here read the CSV lazily with
+``pl.scan_csv`` (so only the needed columns are actually parsed) and
+return plain pandas DataFrames with the same columns as their pandas
+counterparts in ``spotify_analysis.py``, so callers can switch between
+the two without changing anything else.
+
+Polars is an optional dependency: import this module and check
+``POLARS_AVAILABLE`` before calling anything.
+"""
+
+from pathlib import Path
+
+try:
+    import polars as pl
+
+    POLARS_AVAILABLE = True
+except ImportError:
+    pl = None
+    POLARS_AVAILABLE = False
+
+# Same data folder as the pandas implementation.
+DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "raw"
+
+
+def _require_polars():
+    """Raise a clear error when Polars is not installed."""
+    if not POLARS_AVAILABLE:
+        raise ImportError(
+            "polars is not installed; run 'pip install polars' or use the "
+            "pandas functions in spotify_analysis.py instead."
+        )
+
+
+def _scan_charts(csv_name):
+    """Build a lazy Polars scan over a CSV in ``data/raw``.
+
+    Lazy scanning lets Polars push column selection and aggregation
+    down into the reader, so it never materializes columns we do not
+    use.
+    """
+    csv_path = DATA_DIR / csv_name
+
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found at: {csv_path}")
+
+    lazy = pl.scan_csv(csv_path, try_parse_dates=True)
+
+    # Match the column names used by the pandas implementation.
+    rename_map = {"name": "track_name", "artists": "artist"}
+    present = lazy.collect_schema().names()
+    lazy = lazy.rename(
+        {old: new for old, new in rename_map.items() if old in present}
+    )
+
+    return lazy
+
+
+def compute_song_summary_polars(csv_name, top_n=None):
+    """Polars version of ``spotify_analysis.compute_song_summary``.
+
+    Parameters
+    ----------
+    csv_name : str
+        File name inside ``data/raw``, e.g. ``"charts_2023.csv"``.
+    top_n : int, optional
+        If given, return only the ``top_n`` songs by total streams.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per song with ``track_name``, ``artist``,
+        ``country_count``, ``days_on_chart`` and ``total_streams``.
+    """
+    _require_polars()
+
+    summary = (
+        _scan_charts(csv_name)
+        .group_by(["track_name", "artist"], maintain_order=False)
+        .agg(
+            pl.col("country").n_unique().alias("country_count"),
+            pl.col("date").n_unique().alias("days_on_chart"),
+            pl.col("streams").sum().alias("total_streams"),
+        )
+        .sort("total_streams", descending=True)
+    )
+
+    if top_n is not None:
+        summary = summary.head(top_n)
+
+    return summary.collect().to_pandas()
+
+
+def compute_chart_diversity_by_country_polars(csv_name, top_n=None):
+    """Polars version of ``compute_chart_diversity_by_country``.
+
+    Returns a pandas DataFrame with ``country`` and ``unique_tracks``,
+    sorted by ``unique_tracks`` in descending order.
+    """
+    _require_polars()
+
+    diversity = (
+        _scan_charts(csv_name)
+        .group_by("country", maintain_order=False)
+        .agg(pl.col("track_name").n_unique().alias("unique_tracks"))
+        .sort("unique_tracks", descending=True)
+    )
+
+    if top_n is not None:
+        diversity = diversity.head(top_n)
+
+    return diversity.collect().to_pandas()
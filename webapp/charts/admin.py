@@ -1,5 +1,20 @@
 from django.contrib import admin
-from .models import ChartEntry
+from .models import ChartEntry, Track
+
+
+@admin.register(Track)
+class TrackAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Track.
+
+    One row per track, holding the metadata shared by all of its
+    chart entries.
+    """
+
+    list_display = ("track_id", "track_name", "artist", "duration", "explicit")
+    list_filter = ("explicit",)
+    search_fields = ("track_name", "artist", "track_id")
+    ordering = ("track_name",)
 
 
 @admin.register(ChartEntry)
@@ -22,6 +37,20 @@ class ChartEntryAdmin(admin.ModelAdmin):
         "streams",
         "explicit",
     )
-    list_filter = ("country", "date", "explicit")
-    search_fields = ("track_name", "artist", "track_id")
+    list_filter = ("country", "date", "track__explicit")
+    search_fields = ("track__track_name", "track__artist", "track__track_id")
     ordering = ("country", "-date", "position")
+    # One JOIN instead of a query per row in the changelist.
+    list_select_related = ("track",)
+
+    @admin.display(description="Track name", ordering="track__track_name")
+    def track_name(self, obj):
+        return obj.track.track_name
+
+    @admin.display(description="Artist", ordering="track__artist")
+    def artist(self, obj):
+        return obj.track.artist
+
+    @admin.display(description="Explicit", boolean=True)
+    def explicit(self, obj):
+        return obj.track.explicit
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-28 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0003_chartentry_unique_chart_row_per_day_country_position'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chartentry',
+            name='charts_char_country_853d0d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chartentry',
+            index=models.Index(fields=['country', 'date', 'position'], name='idx_chart_cdp'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-28 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0004_remove_chartentry_charts_char_country_853d0d_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chartentry',
+            name='track_id',
+            field=models.CharField(db_index=True, help_text='Spotify track identifier from the CSV file.', max_length=32),
+        ),
+    ]
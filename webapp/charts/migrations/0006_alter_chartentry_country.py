@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-28 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0005_alter_chartentry_track_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chartentry',
+            name='country',
+            field=models.CharField(help_text="Country code from the original dataset (for example: 'us', 'global').", max_length=8),
+        ),
+    ]
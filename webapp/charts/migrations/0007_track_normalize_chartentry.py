@@ -0,0 +1,135 @@
+# Hand-written migration: split the repeated track metadata out of
+# ChartEntry into a Track table, then turn ChartEntry.track_id into a
+# foreign key to it. The FK keeps the column name track_id, so existing
+# row values become the FK values directly.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_track_metadata(apps, schema_editor):
+    """Populate Track from the distinct metadata already in ChartEntry."""
+    ChartEntry = apps.get_model("charts", "ChartEntry")
+    Track = apps.get_model("charts", "Track")
+
+    rows = (
+        ChartEntry.objects.order_by()
+        .values(
+            "track_id",
+            "track_name",
+            "artist",
+            "artist_genres",
+            "duration",
+            "explicit",
+        )
+        .distinct()
+    )
+
+    seen = set()
+    tracks = []
+    for row in rows.iterator(chunk_size=10_000):
+        # A track can appear with slightly different metadata across
+        # rows (e.g. genre text); keep the first version we see.
+        if row["track_id"] in seen:
+            continue
+        seen.add(row["track_id"])
+        tracks.append(Track(**row))
+
+    Track.objects.bulk_create(tracks, batch_size=1_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("charts", "0006_alter_chartentry_country"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Track",
+            fields=[
+                (
+                    "track_id",
+                    models.CharField(
+                        help_text="Spotify track identifier from the CSV file.",
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "track_name",
+                    models.CharField(
+                        help_text="Human-readable track name.", max_length=255
+                    ),
+                ),
+                (
+                    "artist",
+                    models.CharField(
+                        help_text="Primary artist name for this track.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "artist_genres",
+                    models.TextField(
+                        blank=True,
+                        help_text="Optional: genres for the artist, often comma-separated or raw text.",
+                    ),
+                ),
+                (
+                    "duration",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="Duration in milliseconds.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "explicit",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the track is marked as explicit in the dataset.",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["track_name"],
+                        name="charts_trac_track_n_4c60ee_idx",
+                    ),
+                    models.Index(
+                        fields=["artist"], name="charts_trac_artist_da1cc5_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(copy_track_metadata, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="chartentry",
+            name="charts_char_track_n_727ddd_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="chartentry",
+            name="charts_char_artist_59a34b_idx",
+        ),
+        migrations.RemoveField(model_name="chartentry", name="track_name"),
+        migrations.RemoveField(model_name="chartentry", name="artist"),
+        migrations.RemoveField(model_name="chartentry", name="artist_genres"),
+        migrations.RemoveField(model_name="chartentry", name="duration"),
+        migrations.RemoveField(model_name="chartentry", name="explicit"),
+        migrations.RenameField(
+            model_name="chartentry", old_name="track_id", new_name="track"
+        ),
+        migrations.AlterField(
+            model_name="chartentry",
+            name="track",
+            field=models.ForeignKey(
+                help_text="Track metadata shared by every chart row for this track.",
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="chart_entries",
+                to="charts.track",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-28 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0007_track_normalize_chartentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chartentry',
+            index=models.Index(fields=['track', 'country'], name='idx_chart_track_country'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-28 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0008_chartentry_idx_chart_track_country'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chartentry',
+            name='charts_char_date_f27a65_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chartentry',
+            index=models.Index(fields=['-date', 'position'], name='ce_date_pos_idx'),
+        ),
+    ]
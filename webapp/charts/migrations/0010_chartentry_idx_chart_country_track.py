@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-28 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0009_remove_chartentry_charts_char_date_f27a65_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chartentry',
+            index=models.Index(fields=['country', 'track'], name='idx_chart_country_track'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+def backfill_month_int(apps, schema_editor):
+    """Fill month_int from the existing date column in one UPDATE."""
+    table = apps.get_model("charts", "ChartEntry")._meta.db_table
+    if schema_editor.connection.vendor == "postgresql":
+        sql = f"UPDATE {table} SET month_int = EXTRACT(MONTH FROM date)"
+    else:
+        sql = f"UPDATE {table} SET month_int = CAST(strftime('%m', date) AS INTEGER)"
+    schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("charts", "0010_chartentry_idx_chart_country_track"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chartentry",
+            name="month_int",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Calendar month (1-12) of `date`, stored for indexed month filtering.",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_month_int, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="chartentry",
+            index=models.Index(
+                fields=["month_int", "-date", "position"],
+                name="idx_chart_month_date",
+            ),
+        ),
+    ]
@@ -1,7 +1,12 @@
+from functools import lru_cache
+from types import MappingProxyType
+
 from django.db import models
 
 
-COUNTRY_LABELS = {
+# Read-only view: every consumer shares this one dict and none can
+# mutate it behind the lru_cache below.
+COUNTRY_LABELS = MappingProxyType({
     "global": "Global",
     "us": "United States (US)",
     "gb": "United Kingdom (GB)",
@@ -13,7 +18,18 @@ COUNTRY_LABELS = {
     "mx": "Mexico (MX)",
     "jp": "Japan (JP)",
     # Any other code will fall back to UPPERCASE
-}
+})
+
+
+@lru_cache(maxsize=None)
+def _pretty_country_cached(code: str) -> str:
+    """Cached label lookup for an already-lowercased code.
+
+    The dataset only contains ~70 distinct codes, so the cache stays
+    tiny while views that label every dropdown entry and table row get
+    O(1) hits instead of repeating the dict-or-uppercase work.
+    """
+    return COUNTRY_LABELS.get(code, code.upper())
 
 
 def pretty_country(code: str) -> str:
@@ -22,47 +38,28 @@ def pretty_country(code: str) -> str:
     """
     if not code:
         return "Unknown"
-    code = str(code).lower()
-    return COUNTRY_LABELS.get(code, code.upper())
+    return _pretty_country_cached(str(code).lower())
 
 
-class ChartEntry(models.Model):
+class Track(models.Model):
     """
-    ChartEntry model
+    Track model
 
-    This model represents a single row from the charts_2023.csv file:
-    - one track
-    - on one chart date
-    - in one country
-
-    Each instance is therefore a combination of:
-    (date, country, position, track information, artist information).
+    One row of track/artist metadata, shared by every chart entry for
+    that track. The same song charting in 50 countries across a year
+    used to repeat its name, artist, genres, duration and explicit flag
+    thousands of times in ChartEntry; now those live here exactly once.
     """
 
-    # Basic chart information
-    date = models.DateField()
-    country = models.CharField(
-        max_length=100,
-        help_text="Country code or name from the original dataset (for example: 'us', 'global').",
-    )
-    position = models.IntegerField(
-        help_text="Chart position of the track on that date (1 = top position)."
-    )
-    streams = models.BigIntegerField(
-        help_text="Number of streams for this track on that date."
-    )
-
-    # Track information (unique ID and readable name)
     track_id = models.CharField(
-        max_length=100,
+        primary_key=True,
+        max_length=32,
         help_text="Spotify track identifier from the CSV file.",
     )
     track_name = models.CharField(
         max_length=255,
         help_text="Human-readable track name.",
     )
-
-    # Artist information
     artist = models.CharField(
         max_length=255,
         help_text="Primary artist name for this track.",
@@ -71,8 +68,6 @@ class ChartEntry(models.Model):
         blank=True,
         help_text="Optional: genres for the artist, often comma-separated or raw text.",
     )
-
-    # Extra metadata about the track
     duration = models.IntegerField(
         help_text="Duration in milliseconds.",
         null=True,
@@ -83,20 +78,109 @@ class ChartEntry(models.Model):
         help_text="Whether the track is marked as explicit in the dataset.",
     )
 
+    class Meta:
+        """
+        Meta configuration for Track.
+
+        - indexes: speed up name/artist searches (these used to live on
+          ChartEntry, where each index entry was repeated per chart row).
+        """
+
+        indexes = [
+            models.Index(fields=["track_name"]),
+            models.Index(fields=["artist"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.track_name} - {self.artist}"
+
+
+class ChartEntry(models.Model):
+    """
+    ChartEntry model
+
+    This model represents a single row from the charts_2023.csv file:
+    - one track
+    - on one chart date
+    - in one country
+
+    Each instance is therefore a combination of:
+    (date, country, position, streams, track reference). The track and
+    artist details themselves are stored once per track on Track.
+    """
+
+    # Basic chart information
+    date = models.DateField()
+    month_int = models.PositiveSmallIntegerField(
+        # Denormalized from date at load time: filtering on
+        # date__month compiles to a function of the date column, which
+        # no b-tree index can serve; an equality on this column can.
+        help_text="Calendar month (1-12) of `date`, stored for indexed month filtering.",
+    )
+    country = models.CharField(
+        # Codes in the dataset are 2-7 characters ('us', 'global'); a
+        # narrow column keeps the composite indexes that lead with
+        # country compact.
+        max_length=8,
+        help_text="Country code from the original dataset (for example: 'us', 'global').",
+    )
+    position = models.IntegerField(
+        help_text="Chart position of the track on that date (1 = top position)."
+    )
+    streams = models.BigIntegerField(
+        help_text="Number of streams for this track on that date."
+    )
+
+    # Track metadata lives on Track; the FK column is still named
+    # track_id, so lookups like Count("track_id") keep working.
+    track = models.ForeignKey(
+        Track,
+        on_delete=models.PROTECT,
+        related_name="chart_entries",
+        help_text="Track metadata shared by every chart row for this track.",
+    )
+
     class Meta:
         """
         Meta configuration for ChartEntry.
 
-        - indexes: speed up common queries by country, track_name, artist and date.
+        - indexes: speed up common queries by country and date.
+          The composite (country, date, position) index matches the default
+          ordering below, so listing queries can walk the index instead of
+          sorting; it also covers country-only lookups as a prefix, which is
+          why there is no separate country index.
         - ordering: default ordering when we call ChartEntry.objects.all().
         - constraints: enforce that (date, country, position) is unique.
         """
 
         indexes = [
-            models.Index(fields=["country"]),
-            models.Index(fields=["track_name"]),
-            models.Index(fields=["artist"]),
-            models.Index(fields=["date"]),
+            models.Index(
+                fields=["country", "date", "position"],
+                name="idx_chart_cdp",
+            ),
+            # Matches the browser's ORDER BY -date, position, so pages
+            # stream straight from index order with no sort; date-only
+            # lookups use it as a prefix.
+            models.Index(fields=["-date", "position"], name="ce_date_pos_idx"),
+            # Serves the per-track COUNT(DISTINCT country) aggregate
+            # with an index-only scan.
+            models.Index(
+                fields=["track", "country"],
+                name="idx_chart_track_country",
+            ),
+            # Covering index for the diversity view's per-country
+            # COUNT(DISTINCT track_id): pairs arrive pre-grouped and
+            # pre-sorted, no temp B-tree.
+            models.Index(
+                fields=["country", "track"],
+                name="idx_chart_country_track",
+            ),
+            # Month-filtered browser pages: equality on month_int,
+            # then rows stream out already in browsing order.
+            models.Index(
+                fields=["month_int", "-date", "position"],
+                name="idx_chart_month_date",
+            ),
         ]
         ordering = ["country", "date", "position"]
         constraints = [
@@ -113,7 +197,7 @@ class ChartEntry(models.Model):
         Example:
             "Song Title - Artist Name (us, 2023-01-01, #1)"
         """
-        return f"{self.track_name} - {self.artist} ({self.country}, {self.date}, #{self.position})"
+        return f"{self.track} ({self.country}, {self.date}, #{self.position})"
 
     @property
     def country_label(self) -> str:
@@ -1,115 +1,181 @@
-import matplotlib.pyplot as plt
-import io
-import base64
-import matplotlib.colors as mcolors
-import numpy as np
-from matplotlib.patches import FancyBboxPatch
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
 
-def get_spotify_chart(labels, values, title, xlabel, orientation='h'):
-    """
-    Generates Spotify-style chart.
-    Fixes rendering artifacts and clipping issues on top bars.
-    """
-    # 1. Setup Theme
-    plt.style.use('dark_background')
-    plt.rcParams['font.family'] = 'sans-serif'
-    plt.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'Helvetica', 'DejaVu Sans']
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    fig.patch.set_facecolor('none')
-    ax.set_facecolor('none')
-
-    TEXT_COLOR = '#ffffff'
-    SUBTLE_GRAY = '#b3b3b3'
-    # Gradient: Dark Green to Spotify Bright Green
-    color_start = "#115e2f" 
-    color_end = "#1db954"
-
-    # 2. Clean Labels
-    clean_labels = []
+from django.conf import settings
+
+# Shared Spotify theme colors
+TEXT_COLOR = "#ffffff"
+SUBTLE_GRAY = "#b3b3b3"
+# Gradient: Dark Green to Spotify Bright Green
+COLOR_START = "#115e2f"
+COLOR_END = "#1db954"
+
+
+def _clean_labels(labels):
+    """Strip list-literal artifacts from labels and truncate long ones."""
+    cleaned = []
     for label in labels:
         lbl = label.replace("['", "").replace("']", "").replace("', '", ", ")
-        clean_labels.append(lbl[:35] + "..." if len(lbl) > 35 else lbl)
-
-    indices = np.arange(len(clean_labels))
-    
-    # 3. Horizontal Bars
-    if orientation == 'h':
-        # Custom colormap
-        cmap = mcolors.LinearSegmentedColormap.from_list("spotify_grad", [color_start, color_end])
-
-        # Add breathing room for labels on the right
-        ax.set_xlim(0, max(values) * 1.15)
-        
-        # Indices run from 0 to N-1. We extend limits to -0.6 and N-0.4
-        # to ensure the rounded corners of the first and last bars are fully visible.
-        ax.set_ylim(-0.6, len(clean_labels) - 0.4)
-
-        for y, v in zip(indices, values):
-            # High-res gradient tile (100x256) to prevent X-artifacts
-            grad = np.tile(np.linspace(0, 1, 256), (100, 1))
-
-            # Rounded Box Shape
-            bbox = FancyBboxPatch(
-                (0, y - 0.325), v, 0.65,
-                boxstyle="round,pad=0,rounding_size=0.1",
-                linewidth=0, color='none'
+        cleaned.append(lbl[:35] + "..." if len(lbl) > 35 else lbl)
+    return cleaned
+
+
+def format_value(value):
+    """Humanize big numbers (stream counts) for display."""
+    if value >= 1_000_000_000:
+        return f"{value / 1_000_000_000:.1f}B"
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    return str(value)
+
+
+def _render_svg(labels, values, title, xlabel, orientation):
+    """
+    Builds the chart as a hand-written SVG string.
+
+    SVG is just text: one <linearGradient> in <defs> plus a rounded
+    <rect> and a couple of <text> elements per bar. The browser renders
+    it at native resolution, so there is no server-side rasterization
+    at all (the old matplotlib version spent 100-500ms per chart on
+    that).
+    """
+    clean_labels = _clean_labels(labels)
+    max_value = max(values) if values else 1
+    if max_value <= 0:
+        max_value = 1
+
+    width = 800
+    parts = []
+
+    # 1. Gradient definition, shared by every bar
+    defs = (
+        '<defs><linearGradient id="spotify-grad" x1="0" y1="0" x2="1" y2="0">'
+        f'<stop offset="0%" stop-color="{COLOR_START}"/>'
+        f'<stop offset="100%" stop-color="{COLOR_END}"/>'
+        "</linearGradient></defs>"
+    )
+
+    # 2. Horizontal Bars
+    if orientation == "h":
+        label_width = 270
+        bar_max = width - label_width - 80
+        slot = 44
+        bar_height = 30
+        top = 72
+        height = top + slot * len(clean_labels) + 12
+
+        # Title + axis label above the bars
+        parts.append(
+            f'<text x="10" y="30" fill="{TEXT_COLOR}" font-size="18" '
+            f'font-weight="bold">{escape(title)}</text>'
+        )
+        parts.append(
+            f'<text x="{label_width}" y="58" fill="{SUBTLE_GRAY}" '
+            f'font-size="12">{escape(xlabel)}</text>'
+        )
+
+        for i, (label, value) in enumerate(zip(clean_labels, values)):
+            y = top + i * slot
+            bar_width = max(bar_max * value / max_value, 2)
+            text_y = y + bar_height / 2 + 4
+            parts.append(
+                f'<text x="{label_width - 8}" y="{text_y:.0f}" '
+                f'fill="{TEXT_COLOR}" font-size="13" font-weight="600" '
+                f'text-anchor="end">{escape(label)}</text>'
+            )
+            parts.append(
+                f'<rect x="{label_width}" y="{y}" width="{bar_width:.1f}" '
+                f'height="{bar_height}" rx="8" fill="url(#spotify-grad)"/>'
             )
-            ax.add_patch(bbox)
-
-            # Draw gradient clipped to the rounded box
-            ax.imshow(
-                grad,
-                extent=[0, v, y - 0.325, y + 0.325],
-                aspect="auto",
-                cmap=cmap,
-                clip_path=bbox,
-                clip_on=True,
-                interpolation='bicubic'
+            parts.append(
+                f'<text x="{label_width + bar_width + 8:.1f}" '
+                f'y="{text_y:.0f}" fill="{COLOR_END}" font-size="12" '
+                f'font-weight="bold">{format_value(value)}</text>'
             )
 
-            # Value Label
-            ax.text(v + 1, y, str(v), color=color_end, fontweight='bold', va='center', fontsize=10)
+    # 3. Vertical Bars (Fallback for Diversity View)
+    else:
+        height = 480
+        top = 72
+        baseline = 360  # bars grow up from here; labels sit below
+        plot_height = baseline - top
+        margin = 20
+        slot = (width - 2 * margin) / max(len(clean_labels), 1)
+        bar_width = slot * 0.65
+
+        parts.append(
+            f'<text x="10" y="30" fill="{TEXT_COLOR}" font-size="18" '
+            f'font-weight="bold">{escape(title)}</text>'
+        )
+        parts.append(
+            f'<text x="10" y="58" fill="{SUBTLE_GRAY}" font-size="12">'
+            f"{escape(xlabel)}</text>"
+        )
+
+        for i, (label, value) in enumerate(zip(clean_labels, values)):
+            x = margin + i * slot + (slot - bar_width) / 2
+            bar_height = max(plot_height * value / max_value, 2)
+            y = baseline - bar_height
+            center = x + bar_width / 2
+            parts.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" '
+                f'height="{bar_height:.1f}" rx="6" fill="{COLOR_END}" '
+                'fill-opacity="0.9"/>'
+            )
+            parts.append(
+                f'<text x="{center:.1f}" y="{y - 6:.1f}" '
+                f'fill="{COLOR_END}" font-size="12" font-weight="bold" '
+                f'text-anchor="middle">{format_value(value)}</text>'
+            )
+            # Slanted country labels, like matplotlib's rotation=45
+            parts.append(
+                f'<text x="{center:.1f}" y="378" fill="{TEXT_COLOR}" '
+                f'font-size="11" text-anchor="end" '
+                f'transform="rotate(-45 {center:.1f} 378)">'
+                f"{escape(label)}</text>"
+            )
 
-        # Axis Styling
-        ax.set_yticks(indices)
-        ax.set_yticklabels(clean_labels, fontsize=10, color=TEXT_COLOR, fontweight='600')
-        ax.invert_yaxis() # Rank #1 at top
-        
-        ax.xaxis.tick_top()
-        ax.xaxis.set_label_position('top')
-        ax.set_xlabel(xlabel, color=SUBTLE_GRAY, labelpad=10)
+    body = "".join(parts)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="0 0 {width} {height}" '
+        f'font-family="Inter, Arial, Helvetica, sans-serif">'
+        f"{defs}{body}</svg>"
+    )
 
-    # 4. Vertical Bars (Fallback for Diversity View)
-    else:
-        bars = ax.bar(indices, values, width=0.65, color=color_end, alpha=0.9)
-        ax.set_xticks(indices)
-        ax.set_xticklabels(clean_labels, rotation=45, ha='right', fontsize=9, color=TEXT_COLOR)
-        ax.set_ylabel(xlabel, color=SUBTLE_GRAY)
-        
-        # Add slight padding for vertical bars too
-        ax.set_xlim(-0.6, len(clean_labels) - 0.4)
-        
-        for i, v in enumerate(values):
-            ax.text(i, v + 0.5, str(v), color=color_end, fontweight='bold', ha='center')
-
-    # 5. Global Cleanup
-    ax.grid(axis='x' if orientation == 'h' else 'y', linestyle='--', alpha=0.1)
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-    ax.tick_params(length=0, pad=8, colors=SUBTLE_GRAY)
-    
-    # Title Alignment
-    ax.set_title(title, fontsize=14, fontweight='bold', color=TEXT_COLOR, pad=20, loc='left')
-
-    plt.tight_layout()
-
-    # Output
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', transparent=True, dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    img_data = buffer.getvalue()
-    buffer.close()
-    plt.close(fig)
-
-    return base64.b64encode(img_data).decode('utf-8')
\ No newline at end of file
+
+@lru_cache(maxsize=256)
+def _cached_chart_url(labels, values, title, xlabel, orientation):
+    """Memoized render-to-file: the chart is a pure function of its inputs.
+
+    The file name is a hash of those inputs, so a chart is written once
+    per distinct dataset and reused until the data changes (a reload
+    produces different values, hence a different hash and a new file).
+    """
+    key = hashlib.sha1(
+        repr((labels, values, title, xlabel, orientation)).encode("utf-8")
+    ).hexdigest()
+    relative_path = f"charts/{key}.svg"
+    svg_path = Path(settings.MEDIA_ROOT) / relative_path
+    if not svg_path.exists():
+        svg_path.parent.mkdir(parents=True, exist_ok=True)
+        svg_path.write_text(
+            _render_svg(labels, values, title, xlabel, orientation),
+            encoding="utf-8",
+        )
+    return settings.MEDIA_URL + relative_path
+
+
+def get_spotify_chart(labels, values, title, xlabel, orientation='h'):
+    """
+    Generates a Spotify-style SVG chart and returns its media URL.
+
+    Templates embed the result with src="{{ chart_image_url }}". Serving
+    the chart as a plain file instead of base64 inline keeps the image
+    bytes out of every HTML response and lets the browser cache the
+    chart across visits. Lists are converted to tuples here because
+    lru_cache needs hashable arguments.
+    """
+    return _cached_chart_url(tuple(labels), tuple(values), title, xlabel, orientation)
@@ -8,21 +8,269 @@ This file handles the logic for:
 4. Rendering HTML templates with the data.
 """
 
-from django.core.paginator import Paginator
-from django.db.models import Count, Sum, Q
+import base64
+import binascii
+import datetime
+import hashlib
+from operator import itemgetter
+
+from django.core.cache import cache
+from django.db.models import Count, F, Sum, Q
 from django.shortcuts import render
 
-from .models import ChartEntry, pretty_country
-from .utils import get_spotify_chart
+from .models import ChartEntry, Track, pretty_country
+from .utils import format_value, get_spotify_chart
 
-import matplotlib
-<<<<<<< HEAD
 
-# Use a non-interactive backend so Matplotlib can run on the server
-# without needing a display (standard for Django projects).
-=======
->>>>>>> 06ba461f5812338f4ecefba887a22e90ebc4dc40
-matplotlib.use("Agg")
+# ---------- Helpers ----------
+
+
+def _compute_country_dropdown():
+    """
+    Build the list of {code, label} dicts for the browser's country
+    filter. The set of codes in the dataset is static, so the result
+    is cached (see chart_browser) rather than re-queried per request.
+    """
+    country_codes = (
+        ChartEntry.objects.values_list("country", flat=True)
+        .distinct()
+        .order_by("country")
+    )
+    return [
+        {"code": c, "label": pretty_country(c)}
+        for c in country_codes
+        if c is not None
+    ]
+
+
+# Month filter options for the browser dropdown — pure constants, so
+# they are built once at import instead of per request.
+MONTH_NAMES = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+MONTHS = [
+    {"value": i + 1, "label": name} for i, name in enumerate(MONTH_NAMES)
+]
+
+
+# Rows per browser page.
+PAGE_SIZE = 50
+
+
+def _encode_cursor(entry):
+    """Pack a row's (date, position, pk) sort key into an URL token."""
+    raw = f"{entry.date.isoformat()}|{entry.position}|{entry.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(token):
+    """Decode a cursor token; returns None for anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token.encode()).decode()
+        date_str, position, pk = raw.split("|")
+        return datetime.date.fromisoformat(date_str), int(position), int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    """
+    One browser page fetched by keyset (cursor) pagination.
+
+    Instead of LIMIT/OFFSET — where page N makes the database scan and
+    throw away N*50 rows — each page filters on the (date, position,
+    pk) sort key of the row it starts from, so every page is an index
+    seek plus 50 rows, no matter how deep. Mirrors the attributes the
+    browser template uses.
+    """
+
+    def __init__(self, object_list, has_previous, has_next):
+        self.object_list = object_list
+        self.has_previous = has_previous
+        self.has_next = has_next
+
+    @property
+    def prev_cursor(self):
+        return _encode_cursor(self.object_list[0]) if self.object_list else ""
+
+    @property
+    def next_cursor(self):
+        return _encode_cursor(self.object_list[-1]) if self.object_list else ""
+
+
+def _fetch_keyset_page(qs, after, before):
+    """
+    Fetch one page of ``qs`` (already ordered -date, position, pk).
+
+    ``after``/``before`` are decoded cursors: ``after`` continues past
+    the last row of the previous page (older entries), ``before``
+    walks back from the first row (newer entries). One extra row is
+    fetched to learn whether another page exists in that direction.
+    """
+    if after is not None:
+        d, p, k = after
+        rows = list(
+            qs.filter(
+                Q(date__lt=d)
+                | Q(date=d, position__gt=p)
+                | Q(date=d, position=p, pk__gt=k)
+            )[: PAGE_SIZE + 1]
+        )
+        return KeysetPage(rows[:PAGE_SIZE], True, len(rows) > PAGE_SIZE)
+
+    if before is not None:
+        d, p, k = before
+        rows = list(
+            qs.filter(
+                Q(date__gt=d)
+                | Q(date=d, position__lt=p)
+                | Q(date=d, position=p, pk__lt=k)
+            ).order_by("date", "-position", "-pk")[: PAGE_SIZE + 1]
+        )
+        has_previous = len(rows) > PAGE_SIZE
+        rows = rows[:PAGE_SIZE]
+        rows.reverse()
+        return KeysetPage(rows, has_previous, True)
+
+    rows = list(qs[: PAGE_SIZE + 1])
+    return KeysetPage(rows[:PAGE_SIZE], False, len(rows) > PAGE_SIZE)
+
+
+def _browser_count_key(country, month, search, explicit):
+    """Cache key for one browser COUNT(*), per normalized filter combo."""
+    signature = hashlib.md5(
+        repr((country, month, search, explicit)).encode()
+    ).hexdigest()
+    return f"chart_browser_count:{signature}"
+
+
+def warm_browser_counts():
+    """
+    Precompute the browser's header totals for every country/month
+    filter combination and prime the per-filter count cache.
+
+    One GROUP BY over (country, month_int) yields every pairwise
+    count; the country-only, month-only and unfiltered totals are
+    sums of those rows, so no second scan is needed. Called by
+    load_charts after each load — a materialized summary table would
+    duplicate what this one query plus the cache provide, and signal-
+    based upkeep would not even fire for the loader's bulk_create.
+    """
+    pair_rows = ChartEntry.objects.values("country", "month_int").annotate(
+        n=Count("id")
+    )
+    warmed = {}
+    country_totals = {}
+    month_totals = {}
+    total = 0
+    for row in pair_rows:
+        country, month, n = row["country"], row["month_int"], row["n"]
+        warmed[_browser_count_key(country, str(month), "", False)] = n
+        country_totals[country] = country_totals.get(country, 0) + n
+        month_totals[month] = month_totals.get(month, 0) + n
+        total += n
+    for country, n in country_totals.items():
+        warmed[_browser_count_key(country, "", "", False)] = n
+    for month, n in month_totals.items():
+        warmed[_browser_count_key("", str(month), "", False)] = n
+    warmed[_browser_count_key("", "", "", False)] = total
+    cache.set_many(warmed, ANALYTICS_CACHE_TIMEOUT)
+    return warmed
+
+
+# ---------- Analytics aggregates ----------
+# The three analytics pages each reduce ChartEntry to a handful of
+# rows. The compute functions live here at module level so a single
+# helper can refresh all of them in one pass (see
+# warm_analytics_caches); the views themselves only ever read the
+# cached results.
+
+
+def _compute_top_streams():
+    """Top 10 tracks by total streams, name/artist keys kept flat."""
+    return list(
+        ChartEntry.objects.values(
+            track_name=F("track__track_name"), artist=F("track__artist")
+        )
+        .annotate(total_streams=Sum("streams"))
+        .order_by("-total_streams")[:10]
+    )
+
+
+def _compute_top_songs():
+    """Top 20 tracks by number of countries charted in.
+
+    Grouping on the FK value keeps the aggregate on the base table
+    with a narrow group key (served by the (track, country) index) —
+    no join with the track names while grouping 60k rows.
+    """
+    top_rows = list(
+        ChartEntry.objects.values("track_id")
+        .annotate(country_count=Count("country", distinct=True))
+        .order_by("-country_count")[:20]
+    )
+
+    # Resolve names/artists only for the 20 winning tracks
+    track_map = Track.objects.in_bulk([row["track_id"] for row in top_rows])
+    return [
+        {
+            "track_name": track_map[row["track_id"]].track_name,
+            "artist": track_map[row["track_id"]].artist,
+            "country_count": row["country_count"],
+        }
+        for row in top_rows
+    ]
+
+
+def _compute_country_diversity():
+    """Top 10 countries by unique charted tracks, labels attached."""
+    diversity_qs = (
+        ChartEntry.objects.values("country")
+        .annotate(unique_tracks=Count("track_id", distinct=True))
+        .order_by("-unique_tracks")[:10]
+    )
+    return [
+        {
+            "country_label": pretty_country(row["country"]),
+            "unique_tracks": row["unique_tracks"],
+        }
+        for row in diversity_qs
+    ]
+
+
+ANALYTICS_CACHE_TIMEOUT = 3600
+
+_ANALYTICS_CACHES = {
+    "top_streams_agg": _compute_top_streams,
+    "top_songs_agg": _compute_top_songs,
+    "country_diversity_agg": _compute_country_diversity,
+}
+
+
+def warm_analytics_caches():
+    """
+    Recompute every analytics aggregate and store it in the cache.
+
+    Called by load_charts right after a successful load: the three
+    aggregation scans run back-to-back in one warm pass, so no visitor
+    ever hits a cold analytics page. (SQLite's driver executes one
+    statement per round-trip, so the fusion happens at the cache layer
+    rather than as a single multi-result-set query.)
+    """
+    results = {key: compute() for key, compute in _ANALYTICS_CACHES.items()}
+    cache.set_many(results, ANALYTICS_CACHE_TIMEOUT)
+    return results
 
 
 # ---------- Views ----------
@@ -39,19 +287,30 @@ def top_streams(request):
     """
     View: Top Tracks by Total Streams (2023)
     """
-    # 1. Aggregate total streams per track
-    qs = (
-        ChartEntry.objects.values("track_name", "artist")
-        .annotate(total_streams=Sum("streams"))
-        .order_by("-total_streams")[:10]
+    # 1. Fetch the cached aggregate (warmed by load_charts; recomputed
+    # here only if the cache has expired).
+    rows = cache.get_or_set(
+        "top_streams_agg", _compute_top_streams, ANALYTICS_CACHE_TIMEOUT
     )
 
-    # 2. Prepare data for the chart
-    labels = [f"{row['track_name']} – {row['artist']}" for row in qs]
-    values = [row["total_streams"] for row in qs]
+    # 2. Chart and table share the same list, so there is at most one
+    # DB round-trip regardless of template behavior.  The humanized
+    # stream count is attached in the same comprehension rather than
+    # formatted per cell in the template.
+    tracks = [
+        {**row, "formatted_streams": format_value(row["total_streams"])}
+        for row in rows
+    ]
 
-    # 3. Generate Spotify-styled chart
-    chart_image = get_spotify_chart(
+    # 3. Prepare data for the chart (itemgetter grabs both keys in one
+    # lookup per row)
+    labels = [
+        f"{t} – {a}" for t, a in map(itemgetter("track_name", "artist"), tracks)
+    ]
+    values = [row["total_streams"] for row in tracks]
+
+    # 4. Generate Spotify-styled chart
+    chart_image_url = get_spotify_chart(
         labels=labels,
         values=values,
         title="Top 10 Tracks by Total Streams",
@@ -61,8 +320,8 @@ def top_streams(request):
 
     context = {
         "active_page": "top_streams",
-        "tracks": qs,
-        "chart_image": chart_image,
+        "tracks": tracks,
+        "chart_image_url": chart_image_url,
     }
     return render(request, "charts/top_streams.html", context)
 
@@ -71,20 +330,22 @@ def top_songs_by_countries(request):
     """
     View: Top Songs by Number of Countries Appeared In (2023)
     """
-    # 1. Count distinct countries per track
-    qs = (
-        ChartEntry.objects.values("track_name", "artist")
-        .annotate(country_count=Count("country", distinct=True))
-        .order_by("-country_count")[:20]
+    # 1. Fetch the cached aggregate (warmed by load_charts; recomputed
+    # here only if the cache has expired).
+    songs = cache.get_or_set(
+        "top_songs_agg", _compute_top_songs, ANALYTICS_CACHE_TIMEOUT
     )
 
     # 2. Prepare data for chart (Top 10 only)
-    top_for_chart = list(qs[:10])
-    labels = [f"{row['track_name']} – {row['artist']}" for row in top_for_chart]
+    top_for_chart = songs[:10]
+    labels = [
+        f"{t} – {a}"
+        for t, a in map(itemgetter("track_name", "artist"), top_for_chart)
+    ]
     values = [row["country_count"] for row in top_for_chart]
 
     # 3. Generate Spotify-styled chart
-    chart_image = get_spotify_chart(
+    chart_image_url = get_spotify_chart(
         labels=labels,
         values=values,
         title="Global Reach: Top 10 Hits by Country Count",
@@ -94,8 +355,8 @@ def top_songs_by_countries(request):
 
     context = {
         "active_page": "top_songs",
-        "songs": qs,
-        "chart_image": chart_image,
+        "songs": songs,
+        "chart_image_url": chart_image_url,
     }
     return render(request, "charts/top_songs_by_countries.html", context)
 
@@ -104,28 +365,18 @@ def country_diversity(request):
     """
     View: Country Chart Diversity (2023)
     """
-    # 1. Count unique tracks per country
-    base_qs = ChartEntry.objects.values("country")
-    diversity_qs = (
-        base_qs.annotate(unique_tracks=Count("track_id", distinct=True))
-        .order_by("-unique_tracks")[:10]
+    # 1. Fetch the cached aggregate (warmed by load_charts; recomputed
+    # here only if the cache has expired).
+    diversity_rows = cache.get_or_set(
+        "country_diversity_agg", _compute_country_diversity, ANALYTICS_CACHE_TIMEOUT
     )
 
-    # 2. Build rows with pretty names
-    diversity_rows = [
-        {
-            "country_label": pretty_country(row["country"]),
-            "unique_tracks": row["unique_tracks"],
-        }
-        for row in diversity_qs
-    ]
-
-    # 3. Prepare data for chart
+    # 2. Prepare data for chart
     countries = [row["country_label"] for row in diversity_rows]
     values = [row["unique_tracks"] for row in diversity_rows]
 
-    # 4. Generate chart (Vertical for diversity comparison)
-    chart_image = get_spotify_chart(
+    # 3. Generate chart (Vertical for diversity comparison)
+    chart_image_url = get_spotify_chart(
         labels=countries,
         values=values,
         title="Market Diversity: Unique Tracks per Country",
@@ -136,7 +387,7 @@ def country_diversity(request):
     context = {
         "active_page": "country_diversity",
         "diversity_rows": diversity_rows,
-        "chart_image": chart_image,
+        "chart_image_url": chart_image_url,
     }
     return render(request, "charts/country_diversity.html", context)
 
@@ -145,72 +396,106 @@ def chart_browser(request):
     """
     View: Raw 2023 chart entries with filters and pagination.
     """
-    qs = ChartEntry.objects.all().order_by("-date", "position")
+    # select_related pulls the track metadata in the same query, so
+    # rendering the table rows never triggers per-row lookups; only()
+    # trims the SELECT to the columns the table actually shows (no
+    # genres text or duration on any row).
+    qs = (
+        ChartEntry.objects.select_related("track")
+        .only(
+            "date",
+            "country",
+            "position",
+            "streams",
+            "track__track_name",
+            "track__artist",
+            "track__explicit",
+        )
+        # pk breaks ties so the keyset cursor identifies a unique row
+        .order_by("-date", "position", "pk")
+    )
 
     # -------- Dropdown options for filters --------
-    country_codes = (
-        ChartEntry.objects.values_list("country", flat=True)
-        .distinct()
-        .order_by("country")
+    # One SELECT DISTINCT per hour instead of per request; the data
+    # only changes when load_charts runs.
+    countries = cache.get_or_set(
+        "chart_browser_countries", _compute_country_dropdown, 3600
     )
-    countries = [
-        {"code": c, "label": pretty_country(c)}
-        for c in country_codes
-        if c is not None
-    ]
-
-    month_names = [
-        "January",
-        "February",
-        "March",
-        "April",
-        "May",
-        "June",
-        "July",
-        "August",
-        "September",
-        "October",
-        "November",
-        "December",
-    ]
-    months = [{"value": i + 1, "label": month_names[i]} for i in range(12)]
 
     # -------- Read filter values --------
-    country_query = request.GET.get("country", "").strip()
-    month_query = request.GET.get("month", "").strip()
-    search_query = request.GET.get("search", "").strip()
-    explicit_only = request.GET.get("explicit_only") is not None
+    # Grab the QueryDict once; each filter is a single local lookup.
+    g = request.GET
+    country_query = (g.get("country") or "").strip()
+    month_query = (g.get("month") or "").strip()
+    search_query = (g.get("search") or "").strip()
+    explicit_only = "explicit_only" in g
 
     # -------- Apply filters --------
     if country_query:
-        qs = qs.filter(country__iexact=country_query)
+        # Codes are stored lower-case by the loader, so lowering the
+        # query side here keeps the comparison a plain index-friendly
+        # equality — __iexact would wrap the column in LOWER() and
+        # bypass the (country, ...) indexes.
+        qs = qs.filter(country=country_query.lower())
 
     if month_query:
         try:
+            # month_int is denormalized from date at load time; a
+            # plain equality here is index-served, where date__month
+            # would wrap the date column in a function no index can
+            # satisfy.
             month_int = int(month_query)
-            qs = qs.filter(date__month=month_int)
+            qs = qs.filter(month_int=month_int)
         except ValueError:
             pass
 
     if search_query:
-        qs = qs.filter(
+        # Run the LIKE scan over the ~6k Track rows instead of joining
+        # and scanning all 60k chart rows, then pick chart entries by
+        # track id (served by the (track, country) index).
+        matching_tracks = Track.objects.filter(
             Q(track_name__icontains=search_query)
             | Q(artist__icontains=search_query)
-        )
+        ).values("track_id")
+        qs = qs.filter(track_id__in=matching_tracks)
 
     if explicit_only:
-        qs = qs.filter(explicit=True)
+        qs = qs.filter(track__explicit=True)
 
     # -------- Pagination --------
-    paginator = Paginator(qs, 50)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: the page starts where its cursor points, so
+    # the database never scans and discards earlier rows the way
+    # LIMIT/OFFSET does on deep pages.
+    after = _decode_cursor(g.get("after", ""))
+    before = _decode_cursor(g.get("before", ""))
+    page_obj = _fetch_keyset_page(qs, after, before)
+
+    # The COUNT(*) shown in the header is cached per filter
+    # combination (and pre-warmed for country/month combinations by
+    # load_charts), so navigation rarely pays the count query.
+    total_rows = cache.get_or_set(
+        _browser_count_key(
+            country_query, month_query, search_query, explicit_only
+        ),
+        qs.count,
+        300,
+    )
+
+    # Attach display labels to the page rows with one dict lookup per
+    # row, reusing the code -> label map already built for the
+    # dropdown instead of calling pretty_country per entry.
+    country_label_map = {c["code"]: c["label"] for c in countries}
+    for entry in page_obj.object_list:
+        entry.pretty_country = country_label_map.get(
+            entry.country, entry.country
+        )
 
     context = {
         "active_page": "browser",
         "page_obj": page_obj,
+        "total_rows": total_rows,
         "countries": countries,
-        "months": months,
+        "months": MONTHS,
         "country_query": country_query,
         "month_query": month_query,
         "search_query": search_query,
@@ -101,6 +101,20 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        # The warm pass after each data load stores one count per
+        # country/month filter combination (~400 keys); the default
+        # 300-entry cap would cull a third of them straight back out.
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -118,6 +132,13 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Media files (generated chart images)
+# https://docs.djangoproject.com/en/4.2/topics/files/
+
+MEDIA_URL = 'media/'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -4,6 +4,8 @@
 - include all charts-related URLs under the "/charts/" prefix
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
@@ -20,3 +22,6 @@ urlpatterns = [
     # All charts-related pages under /charts/
     path("charts/", include("charts.urls")),
 ]
+
+# Serve generated chart images from MEDIA_ROOT during development
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)